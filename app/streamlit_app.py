@@ -1,7 +1,9 @@
 import json
+import os
 from pathlib import Path
 
 import duckdb
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -18,6 +20,96 @@ def list_views(con) -> set[str]:
     """).df()
     return set(df["table_name"].tolist())
 
+
+def _usable_cpus() -> int:
+    # respects CPU affinity (containers/taskset); os.cpu_count() alone may oversubscribe
+    # (same as train._usable_cpus; the app does not import from src/)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# Streamlit reruns the whole script on every widget change, so the connection and
+# query results are cached. Data loaders are keyed on db_path (not the connection
+# object) so switching the DuckDB path in the sidebar invalidates them.
+@st.cache_resource
+def get_con(db_path: str):
+    # read-only: sessions can share the file, and the app never writes to it
+    con = duckdb.connect(db_path, read_only=True)
+    con.execute(f"SET threads = {_usable_cpus()}")
+    return con
+
+
+def query(db_path: str, sql: str, params: list | None = None) -> pd.DataFrame:
+    # sessions run in separate threads; a cursor per query keeps their results apart
+    # (a DuckDB connection holds a single current result)
+    with get_con(db_path).cursor() as cur:
+        return cur.execute(sql, params).df()
+
+
+@st.cache_resource
+def load_bundle(model_path: str, mtime: float) -> dict:
+    # once per process (mtime in the key picks up a retrained model); arrays are memory-mapped
+    return joblib.load(model_path, mmap_mode="r")
+
+
+@st.cache_data
+def load_glossary(path: str, mtime: float) -> dict:
+    # parsed once; mtime in the key picks up edits to the JSON
+    p = Path(path)
+    return json.loads(p.read_text(encoding="utf-8")) if p.exists() else {}
+
+
+@st.cache_data
+def load_teams(db_path: str) -> pd.DataFrame:
+    return query(db_path, "SELECT team_id, full_name, abbreviation FROM v_teams ORDER BY full_name")
+
+
+@st.cache_data
+def load_views(db_path: str) -> set[str]:
+    with get_con(db_path).cursor() as cur:
+        return list_views(cur)
+
+
+@st.cache_data
+def load_games_ab(db_path: str, team_a: int, team_b: int) -> pd.DataFrame:
+    return query(
+        db_path,
+        """
+        SELECT game_id, game_date, is_home, wl
+        FROM v_games
+        WHERE team_id = ? AND opponent_team_id = ?
+        ORDER BY game_date DESC
+        """,
+        [team_a, team_b]
+    )
+
+
+@st.cache_data
+def load_game_features(db_path: str, dataset_view: str, game_id: str, team_a: int, team_b: int) -> pd.DataFrame:
+    # both teams' rows for the game in one query
+    return query(
+        db_path,
+        f"SELECT * FROM {dataset_view} WHERE game_id = ? AND team_id IN (?, ?)",
+        [game_id, team_a, team_b]
+    )
+
+
+@st.cache_data
+def load_h2h(db_path: str, team_a: int, team_b: int) -> dict:
+    return query(
+        db_path,
+        """
+        SELECT
+          COUNT(*) AS games_count,
+          SUM(CASE WHEN wl='W' THEN 1 ELSE 0 END) AS team_a_wins,
+          SUM(CASE WHEN wl='L' THEN 1 ELSE 0 END) AS team_a_losses
+        FROM v_games
+        WHERE team_id = ? AND opponent_team_id = ?
+        """,
+        [team_a, team_b]
+    ).iloc[0].to_dict()
+
 st.set_page_config(page_title="Matchup Win Probability (NBA)", layout="wide")
 st.title("Matchup Win Probability (NBA)")
 st.caption("Select two teams, choose one of their games, and compare recent form (last 5 games).")
@@ -27,21 +119,26 @@ db_path = st.sidebar.text_input("DuckDB path", "nba.duckdb")
 model_path = st.sidebar.text_input("Model bundle (optional)", "artifacts/model.joblib")
 
 glossary_path = Path(__file__).parent / "feature_glossary.json"
-glossary = json.loads(glossary_path.read_text(encoding="utf-8")) if glossary_path.exists() else {}
+glossary = load_glossary(str(glossary_path), glossary_path.stat().st_mtime if glossary_path.exists() else 0.0)
 
 # Connect DB and load teams
 try:
-    con = duckdb.connect(db_path)
-    teams = con.execute("SELECT team_id, full_name, abbreviation FROM v_teams ORDER BY full_name").df()
+    teams = load_teams(db_path)
 except Exception as e:
     st.sidebar.error(f"Failed to open DuckDB or read v_teams: {e}")
     st.stop()
 
-name_opts = teams.apply(lambda r: f"{r['full_name']} ({r['abbreviation']})", axis=1).tolist()
-id_opts = teams["team_id"].astype(int).tolist()
-label_to_id = dict(zip(name_opts, id_opts))
-id_to_abbr = dict(zip(id_opts, teams["abbreviation"].astype(str).tolist()))
-id_to_name = dict(zip(id_opts, teams["full_name"].astype(str).tolist()))
+# one pass over the rows builds all three lookups (teams arrive sorted by full_name)
+label_to_id, id_to_abbr, id_to_name = {}, {}, {}
+for tid, name, abbr in zip(
+    teams["team_id"].astype(int).tolist(),
+    teams["full_name"].astype(str).tolist(),
+    teams["abbreviation"].astype(str).tolist(),
+):
+    label_to_id[f"{name} ({abbr})"] = tid
+    id_to_abbr[tid] = abbr
+    id_to_name[tid] = name
+name_opts = list(label_to_id)
 
 st.sidebar.header("Pick teams")
 team_a_label = st.sidebar.selectbox("Team A", name_opts, index=0)
@@ -55,43 +152,30 @@ if team_a == team_b:
     st.stop()
 
 # Determine dataset view
-views = list_views(con)
+views = load_views(db_path)
 dataset_view = "v_training_dataset_enriched" if "v_training_dataset_enriched" in views else "v_training_dataset"
 
 # Find head-to-head games (Team A perspective)
-games_ab = con.execute(
-    """
-    SELECT game_id, game_date, is_home, wl
-    FROM v_games
-    WHERE team_id = ? AND opponent_team_id = ?
-    ORDER BY game_date DESC
-    """,
-    [team_a, team_b]
-).df()
+games_ab = load_games_ab(db_path, team_a, team_b)
 
 if games_ab.empty:
     st.info("No games found between these teams in the dataset (Team A vs Team B). Try another pairing.")
     st.stop()
 
-def fmt_game_row(r):
-    loc = "Home" if bool(r["is_home"]) else "Away"
-    res = str(r["wl"]).strip().upper()
-    dt = pd.to_datetime(r["game_date"]).date()
-    return f"{dt} — {loc} — Result: {res} — game_id={r['game_id']}"
+def fmt_game_labels(games: pd.DataFrame) -> list[str]:
+    loc = pd.Series(np.where(games["is_home"].astype(bool), "Home", "Away"), index=games.index)
+    res = games["wl"].astype(str).str.strip().str.upper()
+    dt = pd.to_datetime(games["game_date"]).dt.date.astype(str)
+    return (dt + " — " + loc + " — Result: " + res + " — game_id=" + games["game_id"].astype(str)).tolist()
 
-game_labels = games_ab.apply(fmt_game_row, axis=1).tolist()
+game_labels = fmt_game_labels(games_ab)
 selected_game_label = st.sidebar.selectbox("Choose a game between them", game_labels, index=0)
 selected_game_id = str(games_ab.iloc[game_labels.index(selected_game_label)]["game_id"])
 
 # Pull feature rows for this game (both perspectives)
-feat_a = con.execute(
-    f"SELECT * FROM {dataset_view} WHERE game_id = ? AND team_id = ?",
-    [selected_game_id, team_a]
-).df()
-feat_b = con.execute(
-    f"SELECT * FROM {dataset_view} WHERE game_id = ? AND team_id = ?",
-    [selected_game_id, team_b]
-).df()
+feats = load_game_features(db_path, dataset_view, selected_game_id, team_a, team_b)
+feat_a = feats[feats["team_id"] == team_a].reset_index(drop=True)
+feat_b = feats[feats["team_id"] == team_b].reset_index(drop=True)
 
 if feat_a.empty or feat_b.empty:
     st.warning("Could not find feature rows for both teams for this game (often happens early season before rolling features exist).")
@@ -119,12 +203,13 @@ proba_a = None
 proba_b = None
 if joblib is not None and Path(model_path).exists():
     try:
-        bundle = joblib.load(model_path)
+        bundle = load_bundle(model_path, Path(model_path).stat().st_mtime)
         model = bundle["model"]
         feature_cols = bundle["feature_cols"]
 
-        Xa = feat_a[feature_cols]
-        Xb = feat_b[feature_cols]
+        # models are fitted on float32 feature matrices (see features.feature_matrix)
+        Xa = feat_a[feature_cols].to_numpy(dtype=np.float32, na_value=np.nan)
+        Xb = feat_b[feature_cols].to_numpy(dtype=np.float32, na_value=np.nan)
         proba_a = float(model.predict_proba(Xa)[:, 1][0])
         proba_b = float(model.predict_proba(Xb)[:, 1][0])
     except Exception as e:
@@ -147,76 +232,70 @@ st.markdown("---")
 st.subheader("Comparison (pre-game form, last 5 games)")
 st.caption("These indicators are computed **before the game** using only the previous 5 games (no leakage).")
 
-ignore = {"game_id", "season", "game_date", "team_id", "opponent_team_id", "y_win", "is_home"}
-default_features = [
-    "winrate_l5", "pts_avg_l5", "fg_pct_avg_l5", "fg3_pct_avg_l5",
-    "tov_avg_l5", "reb_avg_l5", "ast_avg_l5", "rest_days"
-]
-for f in ["star_pts_avg_l5_sum", "star_min_avg_l5_avg", "star_pm_avg_l5_avg"]:
-    if f in feat_a.columns:
-        default_features.append(f)
-
-available = [c for c in feat_a.columns if c not in ignore and not c.startswith("opp_")]
-# put defaults first
-available = [c for c in default_features if c in available] + [c for c in available if c not in default_features]
-
-chosen = st.multiselect(
-    "Select indicators to show",
-    options=available,
-    default=[f for f in default_features if f in available]
-)
-
-a = feat_a.iloc[0].to_dict()
-b = feat_b.iloc[0].to_dict()
-
-rows = []
-for k in chosen:
-    av = a.get(k)
-    bv = b.get(k)
-    diff = None
-    try:
-        if pd.notna(av) and pd.notna(bv):
-            diff = float(av) - float(bv)
-    except Exception:
-        diff = None
-
-    rows.append({
-        "Indicator": k,
-        "Explanation": glossary.get(k, ""),
-        f"{a_abbr}": av,
-        f"{b_abbr}": bv,
-        "Difference (A - B)": diff
+
+# Fragments rerun on their own when their widgets change, so picking indicators
+# does not re-execute the team/game selection and DuckDB queries above.
+@st.fragment
+def render_comparison(feat_a: pd.DataFrame, feat_b: pd.DataFrame, a_abbr: str, b_abbr: str, glossary: dict) -> None:
+    ignore = {"game_id", "season", "game_date", "team_id", "opponent_team_id", "y_win", "is_home"}
+    default_features = [
+        "winrate_l5", "pts_avg_l5", "fg_pct_avg_l5", "fg3_pct_avg_l5",
+        "tov_avg_l5", "reb_avg_l5", "ast_avg_l5", "rest_days"
+    ]
+    for f in ["star_pts_avg_l5_sum", "star_min_avg_l5_avg", "star_pm_avg_l5_avg"]:
+        if f in feat_a.columns:
+            default_features.append(f)
+
+    available = [c for c in feat_a.columns if c not in ignore and not c.startswith("opp_")]
+    # put defaults first
+    available = [c for c in default_features if c in available] + [c for c in available if c not in default_features]
+
+    chosen = st.multiselect(
+        "Select indicators to show",
+        options=available,
+        default=[f for f in default_features if f in available]
+    )
+
+    av = feat_a[chosen].iloc[0]
+    bv = feat_b[chosen].iloc[0]
+    diff = pd.to_numeric(av, errors="coerce") - pd.to_numeric(bv, errors="coerce")
+
+    table = pd.DataFrame({
+        "Indicator": chosen,
+        "Explanation": [glossary.get(k, "") for k in chosen],
+        f"{a_abbr}": av.to_numpy(),
+        f"{b_abbr}": bv.to_numpy(),
+        "Difference (A - B)": diff.to_numpy(dtype=float),
     })
+    # largest absolute difference first, missing differences last
+    table = table.iloc[np.argsort(-np.abs(table["Difference (A - B)"].to_numpy()), kind="stable")]
+
+    st.dataframe(table, use_container_width=True)
+
+
+@st.fragment
+def render_h2h(db_path: str, team_a: int, team_b: int) -> None:
+    st.subheader("Head-to-head summary (from Team A perspective)")
+    h2h = load_h2h(db_path, team_a, team_b)
+
+    st.write({
+        "games_in_dataset": int(h2h["games_count"]),
+        "team_a_wins": int(h2h["team_a_wins"]),
+        "team_a_losses": int(h2h["team_a_losses"]),
+    })
+
+
+@st.fragment
+def render_raw_rows(feat_a: pd.DataFrame, feat_b: pd.DataFrame) -> None:
+    with st.expander("Show raw feature rows (for analysts)"):
+        st.write("Team A feature row")
+        st.dataframe(feat_a, use_container_width=True)
+        st.write("Team B feature row")
+        st.dataframe(feat_b, use_container_width=True)
 
-table = pd.DataFrame(rows)
-if not table.empty and "Difference (A - B)" in table.columns:
-    table = table.assign(_abs=table["Difference (A - B)"].abs())
-    table = table.sort_values("_abs", ascending=False).drop(columns=["_abs"])
 
-st.dataframe(table, use_container_width=True)
+render_comparison(feat_a, feat_b, a_abbr, b_abbr, glossary)
 
 st.markdown("---")
-st.subheader("Head-to-head summary (from Team A perspective)")
-h2h = con.execute(
-    """
-    SELECT
-      COUNT(*) AS games_count,
-      SUM(CASE WHEN wl='W' THEN 1 ELSE 0 END) AS team_a_wins,
-      SUM(CASE WHEN wl='L' THEN 1 ELSE 0 END) AS team_a_losses
-    FROM v_games
-    WHERE team_id = ? AND opponent_team_id = ?
-    """,
-    [team_a, team_b]
-).df().iloc[0].to_dict()
-
-st.write({
-    "games_in_dataset": int(h2h["games_count"]),
-    "team_a_wins": int(h2h["team_a_wins"]),
-    "team_a_losses": int(h2h["team_a_losses"]),
-})
-
-with st.expander("Show raw feature rows (for analysts)"):
-    st.write("Team A feature row")
-    st.dataframe(feat_a, use_container_width=True)
-    st.write("Team B feature row")
-    st.dataframe(feat_b, use_container_width=True)
+render_h2h(db_path, team_a, team_b)
+render_raw_rows(feat_a, feat_b)
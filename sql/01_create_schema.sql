@@ -1,5 +1,5 @@
 -- DuckDB SQL
--- Standard tables created by Python loader (src/features.py):
+-- Standard tables created by the loader in src/features.py (load_standard_tables):
 --
 -- teams(team_id, full_name, abbreviation, city, state, year_founded, ...)
 -- games(game_id, season, game_date, team_id, opponent_team_id, is_home, wl,
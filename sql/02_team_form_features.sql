@@ -19,19 +19,18 @@ SELECT
   *,
   CASE WHEN wl = 'W' THEN 1 ELSE 0 END AS y_win,
 
-  date_diff('day',
-    LAG(game_date) OVER (PARTITION BY team_id ORDER BY game_date),
-    game_date
-  ) AS rest_days,
+  date_diff('day', LAG(game_date) OVER w_team, game_date) AS rest_days,
 
-  -- last-5 (excluding current)
-  AVG(pts)     OVER (PARTITION BY team_id ORDER BY game_date ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS pts_avg_l5,
-  AVG(reb)     OVER (PARTITION BY team_id ORDER BY game_date ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS reb_avg_l5,
-  AVG(ast)     OVER (PARTITION BY team_id ORDER BY game_date ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS ast_avg_l5,
-  AVG(tov)     OVER (PARTITION BY team_id ORDER BY game_date ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS tov_avg_l5,
-  AVG(fg_pct)  OVER (PARTITION BY team_id ORDER BY game_date ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS fg_pct_avg_l5,
-  AVG(fg3_pct) OVER (PARTITION BY team_id ORDER BY game_date ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS fg3_pct_avg_l5,
-  AVG(ft_pct)  OVER (PARTITION BY team_id ORDER BY game_date ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS ft_pct_avg_l5,
-  AVG(CASE WHEN wl='W' THEN 1 ELSE 0 END)
-              OVER (PARTITION BY team_id ORDER BY game_date ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS winrate_l5
-FROM g;
+  -- last-5 (excluding current); all share one window so DuckDB sorts each team once
+  AVG(pts)     OVER w_l5 AS pts_avg_l5,
+  AVG(reb)     OVER w_l5 AS reb_avg_l5,
+  AVG(ast)     OVER w_l5 AS ast_avg_l5,
+  AVG(tov)     OVER w_l5 AS tov_avg_l5,
+  AVG(fg_pct)  OVER w_l5 AS fg_pct_avg_l5,
+  AVG(fg3_pct) OVER w_l5 AS fg3_pct_avg_l5,
+  AVG(ft_pct)  OVER w_l5 AS ft_pct_avg_l5,
+  AVG(CASE WHEN wl='W' THEN 1 ELSE 0 END) OVER w_l5 AS winrate_l5
+FROM g
+WINDOW
+  w_team AS (PARTITION BY team_id ORDER BY game_date),
+  w_l5   AS (PARTITION BY team_id ORDER BY game_date ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING);
@@ -3,7 +3,10 @@
 
 CREATE OR REPLACE VIEW v_training_dataset AS
 WITH tf AS (
+  -- drop rows without rolling history before the self-join (same result as filtering after it)
   SELECT * FROM v_team_form
+  WHERE pts_avg_l5 IS NOT NULL
+    AND winrate_l5 IS NOT NULL
 ),
 joined AS (
   SELECT
@@ -42,8 +45,4 @@ joined AS (
    AND a.opponent_team_id = b.team_id
 )
 SELECT *
-FROM joined
-WHERE pts_avg_l5 IS NOT NULL
-  AND opp_pts_avg_l5 IS NOT NULL
-  AND winrate_l5 IS NOT NULL
-  AND opp_winrate_l5 IS NOT NULL;
+FROM joined;
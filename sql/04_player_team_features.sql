@@ -39,14 +39,15 @@ FROM players;
 CREATE OR REPLACE VIEW v_player_form AS
 SELECT
   *,
-  AVG(minutes) OVER (PARTITION BY player_id ORDER BY game_date ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS min_avg_l5,
-  AVG(pts)     OVER (PARTITION BY player_id ORDER BY game_date ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS pts_avg_l5,
-  AVG(plus_minus) OVER (PARTITION BY player_id ORDER BY game_date ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS pm_avg_l5
-FROM v_player_games;
+  AVG(minutes)    OVER w_l5 AS min_avg_l5,
+  AVG(pts)        OVER w_l5 AS pts_avg_l5,
+  AVG(plus_minus) OVER w_l5 AS pm_avg_l5
+FROM v_player_games
+WINDOW w_l5 AS (PARTITION BY player_id ORDER BY game_date ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING);
 
 -- For each team in each game, choose "top 3" players by their *pre-game* scoring form (pts_avg_l5)
 CREATE OR REPLACE VIEW v_team_star_features AS
-WITH ranked AS (
+WITH stars AS (
   SELECT
     game_id,
     team_id,
@@ -55,15 +56,12 @@ WITH ranked AS (
     player_id,
     pts_avg_l5,
     min_avg_l5,
-    pm_avg_l5,
-    ROW_NUMBER() OVER (
-      PARTITION BY game_id, team_id
-      ORDER BY pts_avg_l5 DESC NULLS LAST
-    ) AS rn
+    pm_avg_l5
   FROM v_player_form
-),
-stars AS (
-  SELECT * FROM ranked WHERE rn <= 3
+  QUALIFY ROW_NUMBER() OVER (
+    PARTITION BY game_id, team_id
+    ORDER BY pts_avg_l5 DESC NULLS LAST
+  ) <= 3
 )
 SELECT
   game_id,
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, List, FrozenSet
+import duckdb
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 
 @dataclass(frozen=True)
@@ -19,23 +23,52 @@ def _norm_cols(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _pick(df: pd.DataFrame, candidates: Tuple[str, ...]) -> Optional[str]:
-    cols = set(df.columns)
+def _pick(cols: FrozenSet[str], candidates: Tuple[str, ...]) -> Optional[str]:
+    """First candidate present in `cols`. Both sides are lowercase: `cols` comes from a
+    _norm_cols frame and candidates are lowercase literals."""
     for c in candidates:
-        c2 = c.lower()
-        if c2 in cols:
-            return c2
+        if c in cols:
+            return c
     return None
 
 
+# standardized numeric column -> candidate source columns, in output order
+GAME_STATS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("pts", ("pts",)),
+    ("fg_pct", ("fg_pct",)),
+    ("fg3_pct", ("fg3_pct",)),
+    ("ft_pct", ("ft_pct",)),
+    ("reb", ("reb",)),
+    ("ast", ("ast",)),
+    ("tov", ("tov",)),
+)
+
+PLAYER_GAME_STATS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("pts", ("pts",)),
+    ("reb", ("reb",)),
+    ("ast", ("ast",)),
+    ("tov", ("tov",)),
+    ("plus_minus", ("plus_minus",)),
+    ("fg_pct", ("fg_pct",)),
+    ("fg3_pct", ("fg3_pct",)),
+    ("ft_pct", ("ft_pct",)),
+    ("stl", ("stl",)),
+    ("blk", ("blk",)),
+    ("pf", ("pf",)),
+)
+
+PLAYER_ATTRS: Tuple[str, ...] = ("full_name", "first_name", "last_name", "is_active")
+
+
 def standardize_teams(teams_raw: pd.DataFrame) -> pd.DataFrame:
     df = _norm_cols(teams_raw)
-    id_col = _pick(df, ("id", "team_id"))
-    name_col = _pick(df, ("full_name", "team_name", "nickname"))
-    abbr_col = _pick(df, ("abbreviation", "abbr"))
-    city_col = _pick(df, ("city",))
-    state_col = _pick(df, ("state",))
-    year_col = _pick(df, ("year_founded", "founded"))
+    cols = frozenset(df.columns)
+    id_col = _pick(cols, ("id", "team_id"))
+    name_col = _pick(cols, ("full_name", "team_name", "nickname"))
+    abbr_col = _pick(cols, ("abbreviation", "abbr"))
+    city_col = _pick(cols, ("city",))
+    state_col = _pick(cols, ("state",))
+    year_col = _pick(cols, ("year_founded", "founded"))
 
     if id_col is None:
         raise ValueError("Could not find a team id column in teams CSV. Expected one of: id/team_id.")
@@ -53,16 +86,13 @@ def standardize_teams(teams_raw: pd.DataFrame) -> pd.DataFrame:
 
 def standardize_players(players_raw: pd.DataFrame) -> pd.DataFrame:
     df = _norm_cols(players_raw)
-    id_col = _pick(df, ("id", "player_id"))
+    cols = frozenset(df.columns)
+    id_col = _pick(cols, ("id", "player_id"))
     if id_col is None:
         raise ValueError("Could not find player id column (id/player_id).")
-    out = pd.DataFrame({
-        "player_id": df[id_col].astype("int64"),
-        "full_name": df[_pick(df, ("full_name",))] if _pick(df, ("full_name",)) else None,
-        "first_name": df[_pick(df, ("first_name",))] if _pick(df, ("first_name",)) else None,
-        "last_name": df[_pick(df, ("last_name",))] if _pick(df, ("last_name",)) else None,
-        "is_active": df[_pick(df, ("is_active",))] if _pick(df, ("is_active",)) else None,
-    })
+    out = pd.DataFrame({"player_id": df[id_col].astype("int64")})
+    for name in PLAYER_ATTRS:
+        out[name] = df[name] if name in cols else None
     return out
 
 
@@ -71,33 +101,36 @@ def _derive_season_start_year(d: pd.Series) -> pd.Series:
     return (dt.dt.year - (dt.dt.month < 10).astype(int)).astype("Int64")
 
 
-def _parse_matchup(matchup: str) -> tuple[Optional[str], Optional[str], Optional[bool]]:
-    if not isinstance(matchup, str):
-        return None, None, None
-    s = matchup.strip()
-    parts = s.split()
-    if len(parts) < 3:
-        return None, None, None
-    team = parts[0].upper()
-    if "vs" in parts[1].lower():
-        opp = parts[2].upper()
-        return team, opp, True
-    if parts[1] == "@":
-        opp = parts[2].upper()
-        return team, opp, False
-    return None, None, None
+_MATCHUP_RE = r"^\s*(?P<team>\S+)\s+(?P<sep>\S*vs\S*|@)\s+(?P<opp>\S+)"
+
+
+def _parse_matchup(matchup: pd.Series) -> pd.DataFrame:
+    """Split MATCHUP strings ('BOS vs. NYK' / 'BOS @ NYK') into team_abbr, opp_abbr, is_home.
+    Rows that don't match get missing values in all three columns."""
+    ext = matchup.astype(str).str.extract(_MATCHUP_RE, flags=re.IGNORECASE)
+    is_home = ext["sep"].str.lower().str.contains("vs", regex=False).astype("boolean")
+    return pd.DataFrame({
+        "team_abbr": ext["team"].str.upper(),
+        "opp_abbr": ext["opp"].str.upper(),
+        "is_home": is_home.mask(ext["sep"].isna()),
+    })
+
+
+def _abbr_to_id(abbr: pd.Series, team_abbrev_to_id: Dict[str, int]) -> pd.Series:
+    return abbr.map(team_abbrev_to_id).astype("Int64")
 
 
 def standardize_games(games_raw: pd.DataFrame, team_abbrev_to_id: Optional[Dict[str, int]] = None) -> pd.DataFrame:
     df = _norm_cols(games_raw)
-    team_id_col = _pick(df, ("team_id",))
-    wl_col = _pick(df, ("wl", "w_l"))
-    matchup_col = _pick(df, ("matchup",))
-    opp_id_col = _pick(df, ("opponent_team_id", "opp_team_id"))
+    cols = frozenset(df.columns)
+    team_id_col = _pick(cols, ("team_id",))
+    wl_col = _pick(cols, ("wl", "w_l"))
+    matchup_col = _pick(cols, ("matchup",))
+    opp_id_col = _pick(cols, ("opponent_team_id", "opp_team_id"))
 
-    game_id_col = _pick(df, ("game_id", "id"))
-    season_col = _pick(df, ("season", "season_id", "year"))
-    date_col = _pick(df, ("game_date_real", "game_date_est", "game_date", "date"))
+    game_id_col = _pick(cols, ("game_id", "id"))
+    season_col = _pick(cols, ("season", "season_id", "year"))
+    date_col = _pick(cols, ("game_date_real", "game_date_est", "game_date", "date"))
 
     if team_id_col is None:
         raise ValueError("Could not find TEAM_ID / team_id column in NBA_GAMES CSV.")
@@ -106,9 +139,11 @@ def standardize_games(games_raw: pd.DataFrame, team_abbrev_to_id: Optional[Dict[
     if date_col is None:
         raise ValueError("Could not find a game date column (GAME_DATE_REAL / GAME_DATE / GAME_DATE_EST).")
 
+    game_date = pd.to_datetime(df[date_col], errors="coerce")
+
     out = pd.DataFrame({
         "game_id": df[game_id_col].astype(str) if game_id_col else pd.RangeIndex(len(df)).astype(str),
-        "game_date": pd.to_datetime(df[date_col], errors="coerce").dt.date,
+        "game_date": game_date.dt.date,
         "team_id": df[team_id_col].astype("int64"),
         "wl": df[wl_col].astype(str).str.upper().str.strip(),
     })
@@ -116,36 +151,27 @@ def standardize_games(games_raw: pd.DataFrame, team_abbrev_to_id: Optional[Dict[
     if season_col is not None:
         out["season"] = pd.to_numeric(df[season_col], errors="coerce").astype("Int64")
         if out["season"].isna().all():
-            out["season"] = _derive_season_start_year(pd.to_datetime(df[date_col], errors="coerce"))
+            out["season"] = _derive_season_start_year(game_date)
     else:
-        out["season"] = _derive_season_start_year(pd.to_datetime(df[date_col], errors="coerce"))
+        out["season"] = _derive_season_start_year(game_date)
 
     if opp_id_col is not None:
         out["opponent_team_id"] = pd.to_numeric(df[opp_id_col], errors="coerce").astype("Int64")
-        is_home_col = _pick(df, ("is_home", "home"))
+        is_home_col = _pick(cols, ("is_home", "home"))
         out["is_home"] = df[is_home_col].astype(bool) if is_home_col else False
     else:
         if matchup_col is None:
             raise ValueError("No OPPONENT_TEAM_ID and no MATCHUP to parse opponent.")
-        parsed = df[matchup_col].apply(_parse_matchup)
-        out["is_home"] = parsed.apply(lambda t: t[2])
-        opp_abbr = parsed.apply(lambda t: t[1])
+        parsed = _parse_matchup(df[matchup_col])
+        out["is_home"] = parsed["is_home"]
         if team_abbrev_to_id is None:
             raise ValueError("Need team_abbrev_to_id mapping to convert opponent abbreviation -> opponent_team_id.")
-        out["opponent_team_id"] = opp_abbr.map(lambda a: team_abbrev_to_id.get(str(a).upper()) if pd.notna(a) else None).astype("Int64")
+        out["opponent_team_id"] = _abbr_to_id(parsed["opp_abbr"], team_abbrev_to_id)
 
-    def add_stat(std_name: str, cand: Tuple[str, ...]):
-        c = _pick(df, cand)
+    for std_name, cand in GAME_STATS:
+        c = _pick(cols, cand)
         out[std_name] = pd.to_numeric(df[c], errors="coerce") if c else None
 
-    add_stat("pts", ("pts",))
-    add_stat("fg_pct", ("fg_pct",))
-    add_stat("fg3_pct", ("fg3_pct", "fg3_pct"))
-    add_stat("ft_pct", ("ft_pct",))
-    add_stat("reb", ("reb",))
-    add_stat("ast", ("ast",))
-    add_stat("tov", ("tov",))
-
     out = out.dropna(subset=["game_id", "game_date", "team_id", "opponent_team_id", "season"])
     out["is_home"] = out["is_home"].fillna(False).astype(bool)
     out["opponent_team_id"] = out["opponent_team_id"].astype("int64")
@@ -153,35 +179,28 @@ def standardize_games(games_raw: pd.DataFrame, team_abbrev_to_id: Optional[Dict[
     return out
 
 
-def _min_to_float(x) -> Optional[float]:
+def _min_to_float(minutes: pd.Series) -> pd.Series:
     """Convert MIN column to float minutes.
-    Accepts numeric or 'MM:SS' strings."""
-    if pd.isna(x):
-        return None
-    if isinstance(x, (int, float)):
-        return float(x)
-    s = str(x).strip()
-    if ":" in s:
-        mm, ss = s.split(":", 1)
-        try:
-            return float(mm) + float(ss) / 60.0
-        except Exception:
-            return None
-    try:
-        return float(s)
-    except Exception:
-        return None
+    Accepts numeric or 'MM:SS' strings; anything else becomes NaN."""
+    out = pd.to_numeric(minutes, errors="coerce").astype("float64")
+    text = minutes[out.isna() & minutes.notna()].astype(str)
+    mmss = text[text.str.contains(":", regex=False)]
+    if not mmss.empty:
+        parts = mmss.str.strip().str.split(":", n=1, expand=True)
+        out.loc[mmss.index] = pd.to_numeric(parts[0], errors="coerce") + pd.to_numeric(parts[1], errors="coerce") / 60.0
+    return out
 
 
 def standardize_player_games(player_games_raw: pd.DataFrame, team_abbrev_to_id: Dict[str, int]) -> pd.DataFrame:
     df = _norm_cols(player_games_raw)
+    cols = frozenset(df.columns)
 
-    player_id_col = _pick(df, ("player_id", "playerid", "player_id"))
-    game_id_col = _pick(df, ("game_id", "id"))
-    season_col = _pick(df, ("season_id", "season"))
-    date_col = _pick(df, ("game_date_real", "game_date", "game_date_est"))
-    matchup_col = _pick(df, ("matchup",))
-    wl_col = _pick(df, ("wl", "w_l"))
+    player_id_col = _pick(cols, ("player_id", "playerid"))
+    game_id_col = _pick(cols, ("game_id", "id"))
+    season_col = _pick(cols, ("season_id", "season"))
+    date_col = _pick(cols, ("game_date_real", "game_date", "game_date_est"))
+    matchup_col = _pick(cols, ("matchup",))
+    wl_col = _pick(cols, ("wl", "w_l"))
 
     if player_id_col is None or game_id_col is None:
         raise ValueError("player_games must include Player_ID and Game_ID columns.")
@@ -195,43 +214,28 @@ def standardize_player_games(player_games_raw: pd.DataFrame, team_abbrev_to_id:
     game_date = pd.to_datetime(df[date_col], errors="coerce")
     season = pd.to_numeric(df[season_col], errors="coerce").astype("Int64") if season_col else _derive_season_start_year(game_date)
 
-    parsed = df[matchup_col].apply(_parse_matchup)
-    team_abbr = parsed.apply(lambda t: t[0])
-    opp_abbr = parsed.apply(lambda t: t[1])
-    is_home = parsed.apply(lambda t: t[2])
+    parsed = _parse_matchup(df[matchup_col])
 
     out = pd.DataFrame({
         "player_id": df[player_id_col].astype("int64"),
         "game_id": df[game_id_col].astype(str),
         "season": season.fillna(_derive_season_start_year(game_date)).astype("Int64"),
         "game_date": game_date.dt.date,
-        "team_id": team_abbr.map(lambda a: team_abbrev_to_id.get(str(a).upper()) if pd.notna(a) else None).astype("Int64"),
-        "opponent_team_id": opp_abbr.map(lambda a: team_abbrev_to_id.get(str(a).upper()) if pd.notna(a) else None).astype("Int64"),
-        "is_home": is_home.fillna(False).astype(bool),
+        "team_id": _abbr_to_id(parsed["team_abbr"], team_abbrev_to_id),
+        "opponent_team_id": _abbr_to_id(parsed["opp_abbr"], team_abbrev_to_id),
+        "is_home": parsed["is_home"].fillna(False).astype(bool),
         "wl": df[wl_col].astype(str).str.upper().str.strip(),
     })
 
+    # minutes: special parser
+    min_col = _pick(cols, ("min", "minutes"))
+    out["minutes"] = _min_to_float(df[min_col]) if min_col else None
+
     # numeric stats (only those we use right now)
-    def add_num(std_name: str, cand: Tuple[str, ...]):
-        c = _pick(df, cand)
+    for std_name, cand in PLAYER_GAME_STATS:
+        c = _pick(cols, cand)
         out[std_name] = pd.to_numeric(df[c], errors="coerce") if c else None
 
-    # minutes: special parser
-    min_col = _pick(df, ("min", "minutes"))
-    out["minutes"] = df[min_col].apply(_min_to_float) if min_col else None
-
-    add_num("pts", ("pts",))
-    add_num("reb", ("reb",))
-    add_num("ast", ("ast",))
-    add_num("tov", ("tov",))
-    add_num("plus_minus", ("plus_minus",))
-    add_num("fg_pct", ("fg_pct",))
-    add_num("fg3_pct", ("fg3_pct", "fg3_pct"))
-    add_num("ft_pct", ("ft_pct",))
-    add_num("stl", ("stl",))
-    add_num("blk", ("blk",))
-    add_num("pf", ("pf",))
-
     out = out.dropna(subset=["player_id", "game_id", "game_date", "team_id", "opponent_team_id"])
     out["team_id"] = out["team_id"].astype("int64")
     out["opponent_team_id"] = out["opponent_team_id"].astype("int64")
@@ -239,14 +243,19 @@ def standardize_player_games(player_games_raw: pd.DataFrame, team_abbrev_to_id:
     return out
 
 
+def _read_csv(path: str) -> pd.DataFrame:
+    # pyarrow's CSV reader is multi-threaded and much faster than the default C engine
+    return pd.read_csv(path, engine="pyarrow")
+
+
 def build_standard_tables(
     teams_csv: str,
     games_csv: str,
     players_csv: Optional[str] = None,
     player_games_csv: Optional[str] = None
 ) -> StandardTables:
-    teams_raw = pd.read_csv(teams_csv)
-    games_raw = pd.read_csv(games_csv)
+    teams_raw = _read_csv(teams_csv)
+    games_raw = _read_csv(games_csv)
 
     teams = standardize_teams(teams_raw)
     mapping = {}
@@ -258,9 +267,288 @@ def build_standard_tables(
     players = None
     player_games = None
     if players_csv and player_games_csv:
-        players_raw = pd.read_csv(players_csv)
-        pg_raw = pd.read_csv(player_games_csv)
+        players_raw = _read_csv(players_csv)
+        pg_raw = _read_csv(player_games_csv)
         players = standardize_players(players_raw)
         player_games = standardize_player_games(pg_raw, team_abbrev_to_id=mapping)
 
     return StandardTables(teams=teams, games=games, players=players, player_games=player_games)
+
+
+# DuckDB-native loader: the same standardization as above, expressed as SQL over DuckDB's
+# multi-threaded CSV reader so the CSVs never pass through pandas. build_standard_tables
+# stays as the pandas path for callers without a DuckDB connection.
+
+_NUMERIC_TYPES = frozenset({"TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "FLOAT", "DOUBLE"})
+_MIN_COLS: Tuple[str, ...] = ("min", "minutes")
+
+
+def _sql_str(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _load_raw(
+    con: duckdb.DuckDBPyConnection, name: str, csv_path: str, text_cols: Tuple[str, ...] = ()
+) -> Dict[str, Tuple[str, str]]:
+    """Creates temp view `name` over read_csv (the CSV is scanned by the final CTAS, not copied).
+    Columns whose normalized name is in `text_cols` are read as VARCHAR.
+    Returns normalized (stripped, lowercase) column name -> (quoted identifier, DuckDB type)."""
+    source = f"read_csv({_sql_str(csv_path)}, header = true, sample_size = -1"
+    if text_cols:
+        header = con.execute(
+            f"DESCRIBE SELECT * FROM read_csv({_sql_str(csv_path)}, header = true, sample_size = 1)"
+        ).fetchall()
+        forced = [col for col, *_ in header if col.strip().lower() in text_cols]
+        if forced:
+            source += ", types = {" + ", ".join(f"{_sql_str(c)}: 'VARCHAR'" for c in forced) + "}"
+    con.execute(f"CREATE OR REPLACE TEMP VIEW {name} AS SELECT * FROM {source})")
+    raw = {}
+    for col, typ, *_ in con.execute(f"DESCRIBE {name}").fetchall():
+        raw[col.strip().lower()] = ('"' + col.replace('"', '""') + '"', typ)
+    return raw
+
+
+def _sql_num(raw: Dict[str, Tuple[str, str]], col: Optional[str]) -> str:
+    # pd.to_numeric(errors="coerce"): keep sniffed numeric types, otherwise TRY_CAST
+    if col is None:
+        return "CAST(NULL AS DOUBLE)"
+    ident, typ = raw[col]
+    return ident if typ in _NUMERIC_TYPES or typ.startswith("DECIMAL") else f"TRY_CAST({ident} AS DOUBLE)"
+
+
+def _sql_date(ident: str) -> str:
+    # ISO dates are sniffed as DATE; also accept NBA-style 'APR 26, 2025' strings
+    return (
+        f"COALESCE(TRY_CAST({ident} AS DATE), "
+        f"CAST(TRY_STRPTIME(CAST({ident} AS VARCHAR), '%b %d, %Y') AS DATE))"
+    )
+
+
+def _sql_game_id(ident: str) -> str:
+    # pandas parses all-digit ids as integers (dropping leading zeros); keep the same ids
+    return f"COALESCE(CAST(TRY_CAST({ident} AS BIGINT) AS VARCHAR), CAST({ident} AS VARCHAR))"
+
+
+def _sql_season_from_date(date_expr: str) -> str:
+    return f"(year({date_expr}) - CAST(month({date_expr}) < 10 AS INTEGER))"
+
+
+def _sql_matchup(ident: str, group: int) -> str:
+    return f"NULLIF(regexp_extract(CAST({ident} AS VARCHAR), '{_MATCHUP_RE}', {group}, 'i'), '')"
+
+
+def _sql_is_home(matchup_ident: str) -> str:
+    sep = _sql_matchup(matchup_ident, 2)
+    return f"CASE WHEN {sep} IS NULL THEN NULL ELSE contains(lower({sep}), 'vs') END"
+
+
+_ABBR_MAP_CTE = """abbr_map AS (
+  SELECT upper(CAST(abbreviation AS VARCHAR)) AS abbr, any_value(team_id) AS team_id
+  FROM teams
+  WHERE abbreviation IS NOT NULL
+  GROUP BY 1
+)"""
+
+
+def _create_teams(con: duckdb.DuckDBPyConnection, teams_csv: str) -> None:
+    raw = _load_raw(con, "_teams_raw", teams_csv)
+    cols = frozenset(raw)
+    id_col = _pick(cols, ("id", "team_id"))
+    if id_col is None:
+        raise ValueError("Could not find a team id column in teams CSV. Expected one of: id/team_id.")
+
+    def text(cand: Tuple[str, ...], null_type: str = "VARCHAR") -> str:
+        c = _pick(cols, cand)
+        return raw[c][0] if c else f"CAST(NULL AS {null_type})"
+
+    con.execute(f"""
+        CREATE OR REPLACE TABLE teams AS
+        SELECT
+          CAST({raw[id_col][0]} AS BIGINT) AS team_id,
+          {text(("full_name", "team_name", "nickname"))} AS full_name,
+          {text(("abbreviation", "abbr"))} AS abbreviation,
+          {text(("city",))} AS city,
+          {text(("state",))} AS state,
+          {text(("year_founded", "founded"), "BIGINT")} AS year_founded
+        FROM _teams_raw
+    """)
+    con.execute("DROP VIEW _teams_raw")
+
+
+def _create_players(con: duckdb.DuckDBPyConnection, players_csv: str) -> None:
+    raw = _load_raw(con, "_players_raw", players_csv)
+    cols = frozenset(raw)
+    id_col = _pick(cols, ("id", "player_id"))
+    if id_col is None:
+        raise ValueError("Could not find player id column (id/player_id).")
+    attrs = ",\n".join(
+        f"{raw[name][0] if name in cols else 'CAST(NULL AS VARCHAR)'} AS {name}" for name in PLAYER_ATTRS
+    )
+    con.execute(f"""
+        CREATE OR REPLACE TABLE players AS
+        SELECT CAST({raw[id_col][0]} AS BIGINT) AS player_id,
+        {attrs}
+        FROM _players_raw
+    """)
+    con.execute("DROP VIEW _players_raw")
+
+
+def _create_games(con: duckdb.DuckDBPyConnection, games_csv: str) -> None:
+    raw = _load_raw(con, "_games_raw", games_csv)
+    cols = frozenset(raw)
+    team_id_col = _pick(cols, ("team_id",))
+    wl_col = _pick(cols, ("wl", "w_l"))
+    matchup_col = _pick(cols, ("matchup",))
+    opp_id_col = _pick(cols, ("opponent_team_id", "opp_team_id"))
+
+    game_id_col = _pick(cols, ("game_id", "id"))
+    season_col = _pick(cols, ("season", "season_id", "year"))
+    date_col = _pick(cols, ("game_date_real", "game_date_est", "game_date", "date"))
+
+    if team_id_col is None:
+        raise ValueError("Could not find TEAM_ID / team_id column in NBA_GAMES CSV.")
+    if wl_col is None:
+        raise ValueError("Could not find WL column in NBA_GAMES CSV.")
+    if date_col is None:
+        raise ValueError("Could not find a game date column (GAME_DATE_REAL / GAME_DATE / GAME_DATE_EST).")
+
+    game_id = _sql_game_id(raw[game_id_col][0]) if game_id_col else "CAST(ROW_NUMBER() OVER () - 1 AS VARCHAR)"
+    season = f"TRY_CAST({_sql_num(raw, season_col)} AS BIGINT)" if season_col else "CAST(NULL AS BIGINT)"
+
+    if opp_id_col is not None:
+        is_home_col = _pick(cols, ("is_home", "home"))
+        opp = f"TRY_CAST({_sql_num(raw, opp_id_col)} AS BIGINT)"
+        is_home = f"CAST(r.{raw[is_home_col][0]} AS BOOLEAN)" if is_home_col else "false"
+        join = ""
+    else:
+        if matchup_col is None:
+            raise ValueError("No OPPONENT_TEAM_ID and no MATCHUP to parse opponent.")
+        matchup = "r." + raw[matchup_col][0]
+        opp = "o.team_id"
+        is_home = _sql_is_home(matchup)
+        join = f"LEFT JOIN abbr_map o ON o.abbr = upper({_sql_matchup(matchup, 3)})"
+
+    stats = ",\n".join(f"{_sql_num(raw, _pick(cols, cand))} AS {name}" for name, cand in GAME_STATS)
+    stat_names = ", ".join(name for name, _ in GAME_STATS)
+
+    con.execute(f"""
+        CREATE OR REPLACE TABLE games AS
+        WITH {_ABBR_MAP_CTE},
+        src AS (
+          SELECT
+            {game_id} AS game_id,
+            {_sql_date("r." + raw[date_col][0])} AS game_date,
+            CAST(r.{raw[team_id_col][0]} AS BIGINT) AS team_id,
+            upper(trim(CAST(r.{raw[wl_col][0]} AS VARCHAR))) AS wl,
+            {season} AS season,
+            {is_home} AS is_home,
+            {opp} AS opponent_team_id,
+            {stats}
+          FROM _games_raw r
+          {join}
+        ),
+        seasoned AS (
+          SELECT * REPLACE (
+            -- like the pandas loader: derive the season from the date when none is usable
+            CASE WHEN COUNT(season) OVER () = 0 THEN {_sql_season_from_date("game_date")} ELSE season END AS season
+          )
+          FROM src
+        )
+        SELECT game_id, game_date, team_id, wl, season, COALESCE(is_home, false) AS is_home,
+               opponent_team_id, {stat_names}
+        FROM seasoned
+        WHERE game_id IS NOT NULL AND game_date IS NOT NULL AND team_id IS NOT NULL
+          AND opponent_team_id IS NOT NULL AND season IS NOT NULL
+    """)
+    con.execute("DROP VIEW _games_raw")
+
+
+def _create_player_games(con: duckdb.DuckDBPyConnection, player_games_csv: str) -> None:
+    # MIN is read as text: 'MM:SS' values all below 24:00 would otherwise be sniffed as TIME
+    raw = _load_raw(con, "_player_games_raw", player_games_csv, text_cols=_MIN_COLS)
+    cols = frozenset(raw)
+    player_id_col = _pick(cols, ("player_id", "playerid"))
+    game_id_col = _pick(cols, ("game_id", "id"))
+    season_col = _pick(cols, ("season_id", "season"))
+    date_col = _pick(cols, ("game_date_real", "game_date", "game_date_est"))
+    matchup_col = _pick(cols, ("matchup",))
+    wl_col = _pick(cols, ("wl", "w_l"))
+
+    if player_id_col is None or game_id_col is None:
+        raise ValueError("player_games must include Player_ID and Game_ID columns.")
+    if date_col is None:
+        raise ValueError("player_games must include GAME_DATE_REAL or GAME_DATE.")
+    if matchup_col is None:
+        raise ValueError("player_games must include MATCHUP for team/opponent parsing.")
+    if wl_col is None:
+        raise ValueError("player_games must include WL.")
+
+    game_date = _sql_date("r." + raw[date_col][0])
+    derived = _sql_season_from_date(game_date)
+    season = f"COALESCE(TRY_CAST({_sql_num(raw, season_col)} AS BIGINT), {derived})" if season_col else derived
+    matchup = "r." + raw[matchup_col][0]
+
+    # minutes: numeric, or 'MM:SS' strings
+    min_col = _pick(cols, _MIN_COLS)
+    if min_col is None:
+        minutes = "CAST(NULL AS DOUBLE)"
+    else:
+        m = f"trim(r.{raw[min_col][0]})"
+        minutes = (
+            f"COALESCE(TRY_CAST({m} AS DOUBLE), "
+            f"TRY_CAST(regexp_extract({m}, '^([^:]*):(.*)$', 1) AS DOUBLE)"
+            f" + TRY_CAST(regexp_extract({m}, '^([^:]*):(.*)$', 2) AS DOUBLE) / 60.0)"
+        )
+
+    stats = ",\n".join(f"{_sql_num(raw, _pick(cols, cand))} AS {name}" for name, cand in PLAYER_GAME_STATS)
+
+    con.execute(f"""
+        CREATE OR REPLACE TABLE player_games AS
+        WITH {_ABBR_MAP_CTE},
+        src AS (
+          SELECT
+            CAST(r.{raw[player_id_col][0]} AS BIGINT) AS player_id,
+            {_sql_game_id("r." + raw[game_id_col][0])} AS game_id,
+            {season} AS season,
+            {game_date} AS game_date,
+            t.team_id AS team_id,
+            o.team_id AS opponent_team_id,
+            COALESCE({_sql_is_home(matchup)}, false) AS is_home,
+            upper(trim(CAST(r.{raw[wl_col][0]} AS VARCHAR))) AS wl,
+            {minutes} AS minutes,
+            {stats}
+          FROM _player_games_raw r
+          LEFT JOIN abbr_map t ON t.abbr = upper({_sql_matchup(matchup, 1)})
+          LEFT JOIN abbr_map o ON o.abbr = upper({_sql_matchup(matchup, 3)})
+        )
+        SELECT *
+        FROM src
+        WHERE player_id IS NOT NULL AND game_id IS NOT NULL AND game_date IS NOT NULL
+          AND team_id IS NOT NULL AND opponent_team_id IS NOT NULL
+    """)
+    con.execute("DROP VIEW _player_games_raw")
+
+
+def load_standard_tables(
+    con: duckdb.DuckDBPyConnection,
+    teams_csv: str,
+    games_csv: str,
+    players_csv: Optional[str] = None,
+    player_games_csv: Optional[str] = None
+) -> None:
+    """Creates (or replaces) the standard tables teams/games[/players/player_games] in `con`
+    straight from the CSVs, with the same schema as build_standard_tables."""
+    _create_teams(con, teams_csv)
+    _create_games(con, games_csv)
+    if players_csv and player_games_csv:
+        _create_players(con, players_csv)
+        _create_player_games(con, player_games_csv)
+
+
+def feature_matrix(tbl: pa.Table | pa.RecordBatch, feature_cols: List[str]) -> np.ndarray:
+    """Stack the model's feature columns of an Arrow table/batch into a float32 matrix.
+    Nulls become NaN (handled by the pipelines' imputer); other columns are never copied."""
+    X = np.empty((tbl.num_rows, len(feature_cols)), dtype=np.float32)
+    for j, c in enumerate(feature_cols):
+        X[:, j] = tbl.column(c).cast(pa.float32()).to_numpy(zero_copy_only=False)
+    return X
@@ -5,31 +5,77 @@ from pathlib import Path
 import joblib
 import duckdb
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from features import feature_matrix
+
+
+OUT_COLS = ["game_id", "game_date", "team_id", "opponent_team_id", "is_home", "y_win"]
+OUT_SUFFIXES = {".parquet": "parquet", ".csv": "csv"}
 
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--db-path", default="nba.duckdb")
     ap.add_argument("--model-path", default="artifacts/model.joblib")
-    ap.add_argument("--out", default="artifacts/predictions_full.csv")
+    ap.add_argument(
+        "--predictions-format",
+        choices=["parquet", "csv"],
+        default=None,
+        help="Output format (default: from the --out suffix, else parquet)"
+    )
+    ap.add_argument("--out", default=None, help="Output file (default: artifacts/predictions_full.<format>)")
+    ap.add_argument("--batch-size", type=int, default=100_000, help="Rows scored per Arrow batch")
     args = ap.parse_args()
 
-    bundle = joblib.load(args.model_path)
+    fmt = args.predictions_format
+    if args.out is not None:
+        suffix_fmt = OUT_SUFFIXES.get(Path(args.out).suffix.lower())
+        if suffix_fmt is None:
+            ap.error(f"--out must end in .parquet or .csv, got {args.out}")
+        if fmt is not None and fmt != suffix_fmt:
+            ap.error(f"--predictions-format {fmt} does not match --out {args.out}")
+        fmt = suffix_fmt
+    fmt = fmt or "parquet"
+
+    # memory-map the model's numpy arrays instead of copying them into RAM
+    bundle = joblib.load(args.model_path, mmap_mode="r")
     model = bundle["model"]
     feature_cols = bundle["feature_cols"]
+    # score the view the model was trained on (enriched models need the star_* columns)
+    view_name = bundle.get("dataset_view", "v_training_dataset")
 
     con = duckdb.connect(args.db_path)
-    df = con.execute("SELECT * FROM v_training_dataset").df()
-    df["game_date"] = pd.to_datetime(df["game_date"])
+    cols = OUT_COLS + [c for c in feature_cols if c not in OUT_COLS]
+    # Stream Arrow record batches so peak memory is bounded by the batch size,
+    # not by the full dataset.
+    reader = con.sql(f"SELECT {', '.join(cols)} FROM {view_name}").arrow(args.batch_size)
 
-    X = df[feature_cols]
-    proba = model.predict_proba(X)[:, 1]
+    out_path = Path(args.out or f"artifacts/predictions_full.{fmt}")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    schema = pa.schema([reader.schema.field(c) for c in OUT_COLS] + [pa.field("pred_win_proba", pa.float64())])
+    writer = pq.ParquetWriter(out_path, schema, compression="snappy") if fmt == "parquet" else None
+    first = True
+    for batch in reader:
+        proba = model.predict_proba(feature_matrix(batch, feature_cols))[:, 1].astype("float64")
+        if writer is not None:
+            # RecordBatch.append_column needs pyarrow>=16; from_arrays works on the pinned >=14
+            writer.write_batch(
+                pa.RecordBatch.from_arrays(batch.select(OUT_COLS).columns + [pa.array(proba)], schema=schema)
+            )
+        else:
+            out = batch.select(OUT_COLS).to_pandas()
+            out["pred_win_proba"] = proba
+            out.to_csv(out_path, index=False, mode="w" if first else "a", header=first)
+        first = False
 
-    out = df[["game_id", "game_date", "team_id", "opponent_team_id", "is_home", "y_win"]].copy()
-    out["pred_win_proba"] = proba
-    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
-    out.to_csv(args.out, index=False)
-    print(f"Wrote {args.out}")
+    if writer is not None:
+        writer.close()
+    elif first:
+        # empty view: still write the header
+        pd.DataFrame(columns=schema.names).to_csv(out_path, index=False)
+    print(f"Wrote {out_path}")
 
 
 if __name__ == "__main__":
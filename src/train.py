@@ -1,20 +1,24 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
 from pathlib import Path
 
 import duckdb
 import joblib
 import numpy as np
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.impute import SimpleImputer
 from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score, log_loss, roc_auc_score
+from sklearn.metrics import log_loss, roc_auc_score
 from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer
 
-from features import build_standard_tables
+from features import feature_matrix, load_standard_tables
 
 BASE_SQL_ORDER = [
     "sql/01_create_schema.sql",
@@ -30,32 +34,101 @@ NAMED_VIEWS_SQL = "sql/05_named_views.sql"
 
 
 def time_split(
-    df: pd.DataFrame,
+    con: duckdb.DuckDBPyConnection,
+    view_name: str,
+    columns: list[str],
     date_col: str = "game_date",
     test_size: float = 0.2,
     val_size: float = 0.1,
-) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    df = df.sort_values(date_col).reset_index(drop=True)
-    n = len(df)
+) -> tuple[pa.Table, pa.Table, pa.Table]:
+    """
+    Chronological train/val/test split done in DuckDB.
+
+    The view is evaluated once into a temp table numbered by date (ties broken by
+    game_id/team_id so the split is deterministic); only `columns` are fetched, as Arrow tables.
+    """
+    con.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE _split AS
+        SELECT {", ".join(columns)},
+               ROW_NUMBER() OVER (ORDER BY {date_col}, game_id, team_id) AS _rn
+        FROM {view_name}
+        """
+    )
+    n = con.execute("SELECT COUNT(*) FROM _split").fetchone()[0]
     n_test = int(round(n * test_size))
     n_val = int(round(n * val_size))
-
-    test = df.iloc[-n_test:]
-    val = df.iloc[-(n_test + n_val) : -n_test] if n_val > 0 else df.iloc[0:0]
-    train = df.iloc[: -(n_test + n_val)]
+    n_train = n - n_test - n_val
+
+    def rows(lo: int, hi: int) -> pa.Table:
+        return con.sql(
+            f"SELECT {', '.join(columns)} FROM _split WHERE _rn > ? AND _rn <= ? ORDER BY _rn",
+            params=[lo, hi],
+        ).to_arrow_table()
+
+    train = rows(0, n_train)
+    val = rows(n_train, n_train + n_val)
+    test = rows(n_train + n_val, n)
+    con.execute("DROP TABLE _split")
     return train, val, test
 
 
-def evaluate(model, X: pd.DataFrame, y: pd.Series, name: str) -> dict:
-    proba = model.predict_proba(X)[:, 1]
-    preds = (proba >= 0.5).astype(int)
+def view_columns(con: duckdb.DuckDBPyConnection, view_name: str) -> list[str]:
+    df = con.execute(
+        """
+        SELECT column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'main' AND table_name = ?
+        ORDER BY ordinal_position
+        """,
+        [view_name],
+    ).df()
+    return df["column_name"].tolist()
+
+
+def _proba_iter(model, X: np.ndarray, batch: int = 50_000):
+    """Yields (start, positive-class probabilities) per row batch of X."""
+    for start in range(0, len(X), batch):
+        yield start, model.predict_proba(X[start:start + batch])[:, 1]
+
+
+def evaluate(model, X: np.ndarray, y: np.ndarray, name: str, batch: int = 50_000) -> dict:
+    # predict_proba allocates an (n, 2) float64 array per call; scoring in batches keeps
+    # only the positive-class column (needed for ROC AUC) for the whole set.
+    proba = np.empty(len(X), dtype=np.float64)
+    ll_sum = 0.0
+    correct = 0
+    for start, p in _proba_iter(model, X, batch):
+        y_chunk = y[start:start + len(p)]
+        proba[start:start + len(p)] = p
+        # log_loss per batch (same clipping as on the full set), weighted back into a mean
+        ll_sum += log_loss(y_chunk, p, labels=[0, 1]) * len(p)
+        correct += int(np.count_nonzero((p >= 0.5).astype(int) == y_chunk))
+    n = len(X)
     return {
         f"{name}_roc_auc": float(roc_auc_score(y, proba)) if len(np.unique(y)) > 1 else None,
-        f"{name}_logloss": float(log_loss(y, proba)),
-        f"{name}_accuracy": float(accuracy_score(y, preds)),
+        f"{name}_logloss": float(ll_sum / n),
+        f"{name}_accuracy": float(correct / n),
     }
 
 
+def _usable_cpus() -> int:
+    # respects CPU affinity (containers/taskset); os.cpu_count() alone may oversubscribe
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def configure_duckdb(con: duckdb.DuckDBPyConnection, threads: int | None, memory_limit: str | None) -> None:
+    """
+    Sets DuckDB's worker threads (default: usable CPUs) and, optionally, a memory limit
+    before the window-heavy SQL pipeline runs.
+    """
+    con.execute(f"SET threads = {int(threads or _usable_cpus())}")
+    if memory_limit:
+        con.execute("SET memory_limit = ?", [memory_limit])
+
+
 def list_views(con: duckdb.DuckDBPyConnection) -> set[str]:
     """
     DuckDB-portable view listing (works even when SHOW VIEWS is unsupported).
@@ -99,12 +172,90 @@ def _create_named_views(con: duckdb.DuckDBPyConnection, root: Path, has_players:
             con.execute(marker + parts[1])
 
 
+def _etl_fingerprint(paths: list[Path]) -> str:
+    """
+    Cheap change detector for the ETL inputs (CSVs, SQL scripts, loader code):
+    hashes each file's name, size and mtime rather than its contents.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for p in paths:
+        if p.exists():
+            st = p.stat()
+            h.update(f"{p.name}:{st.st_size}:{st.st_mtime_ns};".encode())
+    return h.hexdigest()
+
+
+def _read_fingerprint(con: duckdb.DuckDBPyConnection) -> str | None:
+    exists = con.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = 'main' AND table_name = '_meta'"
+    ).fetchone()[0]
+    if not exists:
+        return None
+    row = con.execute("SELECT value FROM _meta WHERE key = 'etl_fingerprint'").fetchone()
+    return row[0] if row else None
+
+
+def _write_fingerprint(con: duckdb.DuckDBPyConnection, fingerprint: str) -> None:
+    con.execute("CREATE OR REPLACE TABLE _meta (key VARCHAR, value VARCHAR)")
+    con.execute("INSERT INTO _meta VALUES ('etl_fingerprint', ?)", [fingerprint])
+
+
+def _run_etl(
+    con: duckdb.DuckDBPyConnection,
+    root: Path,
+    teams_csv: Path,
+    games_csv: Path,
+    players_csv: Path,
+    player_games_csv: Path,
+    has_players: bool,
+) -> None:
+    """
+    CSV -> standardized tables -> SQL feature views (01..05).
+    """
+    # Recreate tables each run
+    con.execute("DROP TABLE IF EXISTS teams")
+    con.execute("DROP TABLE IF EXISTS games")
+    con.execute("DROP TABLE IF EXISTS players")
+    con.execute("DROP TABLE IF EXISTS player_games")
+
+    # CSVs are read and standardized inside DuckDB (read_csv), no pandas round-trip
+    load_standard_tables(
+        con,
+        str(teams_csv),
+        str(games_csv),
+        str(players_csv) if has_players else None,
+        str(player_games_csv) if has_players else None,
+    )
+
+    # 1) Base SQL pipeline
+    for rel in BASE_SQL_ORDER:
+        sql_text = (root / rel).read_text(encoding="utf-8")
+        con.execute(sql_text)
+
+    # 2) Player enrichment SQL
+    if has_players:
+        for rel in PLAYER_SQL_ORDER:
+            sql_text = (root / rel).read_text(encoding="utf-8")
+            con.execute(sql_text)
+
+    # 3) Named views for UI/BI
+    _create_named_views(con, root, has_players)
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--data-dir", default="data", help="Folder with NBA_*.csv files")
     ap.add_argument("--db-path", default="nba.duckdb", help="DuckDB file path (created if missing)")
     ap.add_argument("--artifacts-dir", default="artifacts", help="Where to save model & outputs")
     ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--predictions-format", choices=["parquet", "csv"], default="parquet", help="Format of test_predictions")
+    ap.add_argument("--threads", type=int, default=None, help="DuckDB worker threads (default: usable CPUs)")
+    ap.add_argument("--memory-limit", default=None, help="DuckDB memory limit, e.g. 4GB (default: DuckDB's own)")
+    ap.add_argument(
+        "--skip-etl",
+        action="store_true",
+        help="Reuse the tables/views already in --db-path (ETL is also skipped when inputs are unchanged)",
+    )
     args = ap.parse_args()
 
     data_dir = Path(args.data_dir)
@@ -124,67 +275,50 @@ def main() -> None:
 
     has_players = players_csv.exists() and player_games_csv.exists()
 
-    std = build_standard_tables(
-        str(teams_csv),
-        str(games_csv),
-        str(players_csv) if has_players else None,
-        str(player_games_csv) if has_players else None,
-    )
-
-    con = duckdb.connect(str(args.db_path))
-
-    # Recreate tables each run
-    con.execute("DROP TABLE IF EXISTS teams")
-    con.execute("DROP TABLE IF EXISTS games")
-    con.execute("DROP TABLE IF EXISTS players")
-    con.execute("DROP TABLE IF EXISTS player_games")
-
-    con.register("teams_df", std.teams)
-    con.register("games_df", std.games)
-    con.execute("CREATE TABLE teams AS SELECT * FROM teams_df")
-    con.execute("CREATE TABLE games AS SELECT * FROM games_df")
-
-    if has_players and std.players is not None and std.player_games is not None:
-        con.register("players_df", std.players)
-        con.register("player_games_df", std.player_games)
-        con.execute("CREATE TABLE players AS SELECT * FROM players_df")
-        con.execute("CREATE TABLE player_games AS SELECT * FROM player_games_df")
-
     root = Path(__file__).resolve().parents[1]
+    view_name = "v_training_dataset_enriched" if has_players else "v_training_dataset"
 
-    # 1) Base SQL pipeline
-    for rel in BASE_SQL_ORDER:
-        sql_text = (root / rel).read_text(encoding="utf-8")
-        con.execute(sql_text)
+    csvs = [teams_csv, games_csv] + ([players_csv, player_games_csv] if has_players else [])
+    sources = csvs + [root / rel for rel in BASE_SQL_ORDER + PLAYER_SQL_ORDER + [NAMED_VIEWS_SQL]]
+    # loader code: features.py standardizes the CSVs, this file orders the SQL steps and views
+    src_dir = Path(__file__).resolve().parent
+    sources += [src_dir / "features.py", src_dir / "train.py"]
+    fingerprint = _etl_fingerprint(sources)
 
-    # 2) Player enrichment SQL
-    if has_players:
-        for rel in PLAYER_SQL_ORDER:
-            sql_text = (root / rel).read_text(encoding="utf-8")
-            con.execute(sql_text)
+    con = duckdb.connect(str(args.db_path))
+    configure_duckdb(con, args.threads, args.memory_limit)
 
-    # 3) Named views for UI/BI
-    _create_named_views(con, root, has_players)
+    unchanged = _read_fingerprint(con) == fingerprint
+    if view_name in list_views(con) and (args.skip_etl or unchanged):
+        reason = "inputs unchanged" if unchanged else "--skip-etl"
+        print(f"Skipping ETL ({reason}); reusing {view_name} from {args.db_path}")
+    else:
+        con.execute("DROP TABLE IF EXISTS _meta")
+        _run_etl(con, root, teams_csv, games_csv, players_csv, player_games_csv, has_players)
+        _write_fingerprint(con, fingerprint)
 
     # Train on numeric dataset view
-    view_name = "v_training_dataset_enriched" if has_players else "v_training_dataset"
-
-    df = con.execute(f"SELECT * FROM {view_name}").df()
-    df["game_date"] = pd.to_datetime(df["game_date"])
-
     target = "y_win"
     drop_cols = ["game_id", "season", "game_date", "team_id", "opponent_team_id", target]
-    feature_cols = [c for c in df.columns if c not in drop_cols]
+    feature_cols = [c for c in view_columns(con, view_name) if c not in drop_cols]
+    out_cols = ["game_id", "game_date", "team_id", "opponent_team_id", "is_home", target]
+    needed_cols = out_cols + [c for c in feature_cols if c not in out_cols]
+
+    train_tbl, val_tbl, test_tbl = time_split(con, view_name, needed_cols, "game_date", test_size=0.2, val_size=0.1)
 
-    train_df, val_df, test_df = time_split(df, "game_date", test_size=0.2, val_size=0.1)
+    X_train, y_train = feature_matrix(train_tbl, feature_cols), train_tbl.column(target).to_numpy()
+    X_val, y_val = feature_matrix(val_tbl, feature_cols), val_tbl.column(target).to_numpy()
+    X_test, y_test = feature_matrix(test_tbl, feature_cols), test_tbl.column(target).to_numpy()
 
-    X_train, y_train = train_df[feature_cols], train_df[target]
-    X_val, y_val = val_df[feature_cols], val_df[target]
-    X_test, y_test = test_df[feature_cols], test_df[target]
+    # Both pipelines start with a float32 cast (a no-op for feature_matrix output) so that
+    # DataFrame/float64 callers get the same dtype; it halves the bytes through the imputer.
+    # lbfgs keeps float32 only from scikit-learn 1.9; older releases upcast to float64
+    # inside LogisticRegression.fit (the inputs are still float32-rounded either way).
 
     # Linear regression
     lr = Pipeline(
         [
+            ("float32", FunctionTransformer(np.asarray, kw_args={"dtype": np.float32})),
             ("imputer", SimpleImputer(strategy="median")),
             ("model", LogisticRegression(max_iter=2000)),
         ]
@@ -193,6 +327,7 @@ def main() -> None:
     # Hist Gradient Boosting classifier
     hgb = Pipeline(
         [
+            ("float32", FunctionTransformer(np.asarray, kw_args={"dtype": np.float32})),
             ("imputer", SimpleImputer(strategy="median")),
             ("model", HistGradientBoostingClassifier(random_state=args.seed)),
         ]
@@ -227,9 +362,11 @@ def main() -> None:
     (artifacts_dir / "metrics.json").write_text(json.dumps(metrics, indent=2), encoding="utf-8")
 
     test_proba = best.predict_proba(X_test)[:, 1]
-    out = test_df[["game_id", "game_date", "team_id", "opponent_team_id", "is_home", target]].copy()
-    out["pred_win_proba"] = test_proba
-    out.to_csv(artifacts_dir / "test_predictions.csv", index=False)
+    out = test_tbl.select(out_cols).append_column("pred_win_proba", pa.array(test_proba, pa.float64()))
+    if args.predictions_format == "parquet":
+        pq.write_table(out, artifacts_dir / "test_predictions.parquet", compression="snappy")
+    else:
+        out.to_pandas().to_csv(artifacts_dir / "test_predictions.csv", index=False)
 
     print("Done.")
     print("Dataset view:", view_name)